@@ -7,12 +7,17 @@
 by error mitigation techniques to compute expectation values."""
 
 import inspect
+import time
 import typing
 import warnings
-from collections import Counter
+import weakref
+from collections import deque
 from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
 from typing import Any, List, Tuple, cast, get_args
 
+import cirq
 import numpy as np
 import numpy.typing as npt
 
@@ -53,6 +58,128 @@ MeasurementResultLike = [
     list[MeasurementResult],
     tuple[MeasurementResult],
 ]
+# Hashed versions of the above for constant time lookups.
+_FLOAT_LIKE = frozenset(FloatLike)
+_DENSITY_MATRIX_LIKE = frozenset(DensityMatrixLike)
+_MEASUREMENT_RESULT_LIKE = frozenset(MeasurementResultLike)
+
+# Return annotations which identify an executor as batched.
+_BATCHED_LIKE = frozenset(
+    BatchedType[T]  # type: ignore[index]
+    for BatchedType in [
+        Iterable,
+        List,
+        typing.Sequence,
+        Tuple,
+        list,
+        tuple,
+        Sequence,
+    ]
+    for T in get_args(QuantumResult)
+)
+
+
+# Return annotations of executors, weakly keyed so that caching them does not
+# keep executors (or the objects they hold) alive.
+_return_annotations: "weakref.WeakKeyDictionary[Any, Any]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _return_annotation(executor: Callable[..., Any]) -> Any:
+    """Returns the return type annotation of the executor (None if it is not
+    annotated). Lookups are cached, since the same function is often wrapped
+    in many ``Executor`` objects.
+    """
+    # Bound methods are created on every attribute access, so key them by
+    # the underlying function, which has the same return annotation.
+    key = getattr(executor, "__func__", executor)
+    try:
+        return _return_annotations[key]
+    except KeyError:
+        annotation = inspect.getfullargspec(executor).annotations.get("return")
+        _return_annotations[key] = annotation
+        return annotation
+    except TypeError:
+        # Unhashable or not weakly referenceable callables can't be cached.
+        return inspect.getfullargspec(executor).annotations.get("return")
+
+
+def _is_annotation_in(annotation: Any, annotations: frozenset[Any]) -> bool:
+    """Returns True if the (possibly unhashable) type annotation is an element
+    of the set of annotations, else False."""
+    try:
+        return annotation in annotations
+    except TypeError:
+        return False
+
+
+class _AdaptiveBatchSize:
+    """Chooses the size of the next batch sent to a batched executor from
+    the execution time per circuit observed for previous batches.
+
+    The batch size starts at one. It is doubled while at least as many
+    circuits remain as have completed, and grows more slowly as the run nears
+    its end. Since a fixed per-call overhead makes smaller batches slower per
+    circuit, the batch size is only halved after consecutive batches are
+    slower per circuit than the fastest smaller batch, and batch sizes known
+    to be slower per circuit than the current one are not tried again.
+
+    Args:
+        max_batch_size: Maximum size of a batch.
+    """
+
+    # Relative slowdown per circuit which is not attributed to noise.
+    tolerance = 1.2
+    # Number of consecutive slow batches before the batch size is halved.
+    patience = 2
+
+    def __init__(self, max_batch_size: int):
+        self._max_batch_size = max_batch_size
+        self._size = 1
+        self._slow_batches = 0
+        # Fastest observed execution time per circuit of each batch size.
+        self._best_time_per_circuit: dict[int, float] = {}
+
+    @property
+    def size(self) -> int:
+        """Returns the size of the next batch."""
+        return self._size
+
+    def update(
+        self, size: int, seconds: float, completed: int, remaining: int
+    ) -> None:
+        """Updates the batch size from the execution time of a batch.
+
+        Args:
+            size: Number of circuits in the batch.
+            seconds: Execution time of the batch.
+            completed: Number of circuits executed so far.
+            remaining: Number of circuits not yet submitted.
+        """
+        time_per_circuit = seconds / size
+        best = self._best_time_per_circuit
+        best[size] = min(best.get(size, np.inf), time_per_circuit)
+
+        fastest_smaller = min(
+            (t for other, t in best.items() if other < size), default=np.inf
+        )
+        if time_per_circuit > self.tolerance * fastest_smaller:
+            self._slow_batches += 1
+            if self._slow_batches >= self.patience:
+                self._size = max(size // 2, 1)
+                self._slow_batches = 0
+            return
+        self._slow_batches = 0
+
+        # Grow by up to a factor of two, depending on how many circuits
+        # remain relative to those completed.
+        growth = 1.0 + min(remaining / completed, 1.0)
+        grown = min(max(size + 1, int(size * growth)), self._max_batch_size)
+        if best.get(grown, 0.0) <= self.tolerance * best[size]:
+            self._size = grown
+        else:
+            self._size = size
 
 
 class Executor:
@@ -65,24 +192,87 @@ class Executor:
             outputs a sequence of ``mitiq.QuantumResult`` s.
         max_batch_size: Maximum number of programs that can be sent in a
             single batch (if the executor is batched).
+        cache_results: If True, quantum results are cached by circuit and
+            keyword arguments passed to the executor, and reused across calls
+            to ``run`` / ``evaluate``, so that a circuit identical to one
+            executed previously with the same keyword arguments is not
+            executed again. Calls with unhashable keyword arguments bypass
+            the cache.
+        adaptive_batch_size: If True (and the executor is batched), the batch
+            size starts at one and grows while many programs remain and the
+            observed execution time per program does not increase. It is
+            halved after consecutive batches are slower per program than
+            smaller ones, and never exceeds ``max_batch_size``. Else, all
+            batches have ``max_batch_size`` programs.
+        max_concurrent_batches: Maximum number of batches submitted to the
+            executor at the same time (if the executor is batched). Values
+            larger than one call the executor from multiple threads, which
+            can hide the latency of remote backends. Results are always
+            stored in the order of the input programs.
     """
 
     def __init__(
         self,
         executor: Callable[[QPROGRAM | Sequence[QPROGRAM]], Any],
         max_batch_size: int = 75,
+        cache_results: bool = False,
+        adaptive_batch_size: bool = False,
+        max_concurrent_batches: int = 1,
     ) -> None:
         self._executor = executor
 
-        executor_annotation = inspect.getfullargspec(executor).annotations
-        self._executor_return_type = executor_annotation.get("return")
+        self._executor_return_type = _return_annotation(executor)
+        if max_batch_size < 1:
+            raise ValueError(
+                "The maximum batch size must be at least 1 but is "
+                f"{max_batch_size}."
+            )
         self._max_batch_size = max_batch_size
+        self._adaptive_batch_size = adaptive_batch_size
+        if max_concurrent_batches < 1:
+            raise ValueError(
+                "The maximum number of concurrent batches must be at least "
+                f"1 but is {max_concurrent_batches}."
+            )
+        self._max_concurrent_batches = max_concurrent_batches
+
+        # The return type is fixed, so classify it once instead of on every
+        # call to ``evaluate`` / ``run``.
+        return_type = self._executor_return_type
+        self._can_batch = return_type is not None and _is_annotation_in(
+            return_type, _BATCHED_LIKE
+        )
+        self._returns_float = _is_annotation_in(return_type, _FLOAT_LIKE)
+        self._returns_density_matrix = _is_annotation_in(
+            return_type, _DENSITY_MATRIX_LIKE
+        )
+        self._returns_measurements = _is_annotation_in(
+            return_type, _MEASUREMENT_RESULT_LIKE
+        )
 
         self._executed_circuits: list[QPROGRAM] = []
         self._quantum_results: list[QuantumResult] = []
+        # Batched executors return a sequence of results per call, serial
+        # executors a single one, so pick how to store them once.
+        self._stash_results: Callable[[Any], None]
+        self._stash_circuits: Callable[[Any], None]
+        if self._can_batch:
+            self._stash_results = self._quantum_results.extend
+            self._stash_circuits = self._executed_circuits.extend
+        else:
+            self._stash_results = self._quantum_results.append
+            self._stash_circuits = self._executed_circuits.append
 
         self._calls_to_executor: int = 0
 
+        self._cache_results = cache_results
+        # Cached results, keyed by the keyword arguments passed to the
+        # executor and then by circuit.
+        self._result_cache: dict[
+            tuple[tuple[str, Any], ...],
+            dict[cirq.FrozenCircuit, QuantumResult],
+        ] = {}
+
     @property
     def can_batch(self) -> bool:
         """Returns True if the executor is recognized as a "batched executor",
@@ -104,24 +294,7 @@ class Executor:
         Returns:
             True if the executor is detected as batched, else False.
         """
-        return_type = self._executor_return_type
-
-        if return_type is None:
-            return False
-
-        return return_type in (
-            BatchedType[T]  # type: ignore[index]
-            for BatchedType in [
-                Iterable,
-                List,
-                typing.Sequence,
-                Tuple,
-                list,
-                tuple,
-                Sequence,
-            ]
-            for T in get_args(QuantumResult)
-        )
+        return self._can_batch
 
     @property
     def executed_circuits(self) -> list[QPROGRAM]:
@@ -165,16 +338,12 @@ class Executor:
         if not isinstance(circuits, list):
             circuits = [circuits]
 
-        warn_non_hermitian = False
-        if observable:
-            if isinstance(observable, PauliString):
-                if observable.coeff.imag > 0.0001:
-                    warn_non_hermitian = True
-            elif isinstance(observable, Observable):
-                if any(
-                    pauli.coeff.imag > 0.0001 for pauli in observable._paulis
-                ):
-                    warn_non_hermitian = True
+        if isinstance(observable, PauliString):
+            warn_non_hermitian = abs(observable.coeff.imag) > 0.0001
+        else:
+            warn_non_hermitian = (
+                observable is not None and observable._non_hermitian
+            )
         if warn_non_hermitian:
             warnings.warn(
                 "Expected observable to be hermitian. Continue with caution."
@@ -182,7 +351,7 @@ class Executor:
 
         # Check executor and observable compatability with type hinting
         # If FloatLike is specified as a return and observable is used
-        if self._executor_return_type in FloatLike and observable is not None:
+        if self._returns_float and observable is not None:
             # Type hinted as FloatLike and observable passed
             if self._executor_return_type is not None:
                 raise ValueError(
@@ -198,29 +367,31 @@ class Executor:
                 )
         elif observable is None:
             # Type hinted as DensityMatrixLike but no observable is set
-            if self._executor_return_type in DensityMatrixLike:
+            if self._returns_density_matrix:
                 raise ValueError(
                     "When using a density matrix result, an observable "
                     "is required."
                 )
             # Type hinted as MeasurementResulteLike but no observable is set
-            elif self._executor_return_type in MeasurementResultLike:
+            elif self._returns_measurements:
                 raise ValueError(
                     "When using a measurement, or bitstring, like result, an "
                     "observable is required."
                 )
 
         # Get all required circuits to run.
-        if (
-            observable is not None
-            and self._executor_return_type in MeasurementResultLike
-        ):
-            all_circuits = [
-                circuit_with_measurements
-                for circuit in circuits
-                for circuit_with_measurements in observable.measure_in(circuit)
-            ]
+        if observable is not None and self._returns_measurements:
+            # One circuit per group of commuting Pauli strings, per circuit,
+            # filled in place without intermediate per-circuit lists.
             result_step = observable.ngroups
+            all_circuits = cast(
+                list[QPROGRAM], [None] * (len(circuits) * result_step)
+            )
+            for i, circuit in enumerate(circuits):
+                for j, pset in enumerate(observable.groups):
+                    all_circuits[i * result_step + j] = pset.measure_in(
+                        circuit
+                    )
         else:
             all_circuits = circuits
             result_step = 1
@@ -229,27 +400,31 @@ class Executor:
         all_results = self.run(all_circuits, force_run_all, **kwargs)
 
         # Parse the results.
-        if self._executor_return_type in FloatLike:
-            results = np.real_if_close(
-                cast(Sequence[float], all_results)
-            ).tolist()
-
-        elif self._executor_return_type in DensityMatrixLike:
+        if self._returns_float:
+            float_results = np.asarray(cast(Sequence[float], all_results))
+            # Only complex results need their imaginary parts discarded.
+            if float_results.dtype.kind == "c":
+                float_results = np.real_if_close(float_results)
+            results = float_results.tolist()
+
+        elif self._returns_density_matrix:
             observable = cast(Observable, observable)
             all_results = cast(list[npt.NDArray[np.complex64]], all_results)
-            results = [
-                observable._expectation_from_density_matrix(density_matrix)
-                for density_matrix in all_results
-            ]
+            results = observable._batched_expectation_from_density_matrices(
+                all_results
+            )
 
-        elif self._executor_return_type in MeasurementResultLike:
+        elif self._returns_measurements:
             observable = cast(Observable, observable)
             all_results = cast(list[MeasurementResult], all_results)
+            # Consume the results of each circuit's measurement groups in
+            # order, without slicing the list of all results.
+            measurements = iter(all_results)
             results = [
                 observable._expectation_from_measurements(
-                    all_results[i : i + result_step]
+                    islice(measurements, result_step)
                 )
-                for i in range(len(all_results) // result_step)
+                for _ in range(len(all_results) // result_step)
             ]
 
         else:
@@ -273,14 +448,20 @@ class Executor:
             circuits: Circuit or sequence thereof to execute with the executor.
             force_run_all: If True, force every circuit in the input sequence
                 to be executed (if some are identical). Else, detects identical
-                circuits and runs a minimal set.
+                circuits and runs a minimal set. Circuits with a cached result
+                (see ``cache_results``) are never re-executed.
         """
         if not isinstance(circuits, Sequence):
             circuits = [circuits]
 
         start_result_index = len(self._quantum_results)
 
-        if force_run_all:
+        cached = self._kwargs_result_cache(kwargs)
+        use_hashes = bool(circuits) and (
+            cached is not None or not force_run_all
+        )
+        result_cache = {} if cached is None else cached
+        if not use_hashes:
             to_run = circuits
         else:
             # Make circuits hashable.
@@ -290,38 +471,79 @@ class Executor:
             #  Qiskit circuits, potentially causing executed results to be
             #  incorrect. Safe conversions should follow the logic in
             #  mitiq.interface.noise_scaling_converter.
-            _, conversion_type = convert_to_mitiq(circuits[0])
-            hashable_circuits = [
-                convert_to_mitiq(circ)[0].freeze() for circ in circuits
-            ]
-
-            # Get the unique circuits and counts
-            collection = Counter(hashable_circuits)
-            to_run = [
-                convert_from_mitiq(circ.unfreeze(), conversion_type)
-                for circ in collection.keys()
-            ]
+            conversion_type = ""
+
+            # In a single pass, find the circuits to run and, for each input
+            # circuit, the index of its result among the executed circuits
+            # (or None if its result is already cached).
+            hashable_circuits: list[cirq.FrozenCircuit] = []
+            result_indices: list[int | None] = []
+            key_to_index: dict[cirq.FrozenCircuit, int] = {}
+            # Circuits repeated by reference are only converted once.
+            key_by_id: dict[int, cirq.FrozenCircuit] = {}
+            to_run = []
+            for circ in circuits:
+                key = key_by_id.get(id(circ))
+                if key is None:
+                    if isinstance(circ, cirq.Circuit):
+                        # Conversion to Mitiq is the identity for Cirq.
+                        key, circ_type = circ.freeze(), "cirq"
+                    else:
+                        mitiq_circ, circ_type = convert_to_mitiq(circ)
+                        key = mitiq_circ.freeze()
+                    key_by_id[id(circ)] = key
+                    conversion_type = conversion_type or circ_type
+                hashable_circuits.append(key)
+
+                if key in result_cache:
+                    result_indices.append(None)
+                elif force_run_all:
+                    result_indices.append(len(to_run))
+                    to_run.append(circ)
+                else:
+                    if key not in key_to_index:
+                        key_to_index[key] = len(to_run)
+                        to_run.append(
+                            convert_from_mitiq(key.unfreeze(), conversion_type)
+                        )
+                    result_indices.append(key_to_index[key])
 
         if not self.can_batch:
             for circuit in to_run:
                 self._call_executor(circuit, **kwargs)
 
         else:
-            stop = len(to_run)
-            step = self._max_batch_size
-            for i in range(int(np.ceil(stop / step))):
-                batch = to_run[i * step : (i + 1) * step]
-                self._call_executor(batch, **kwargs)
+            self._run_batches(to_run, **kwargs)
 
         results = self._quantum_results[start_result_index:]
 
-        if not force_run_all:
-            # Expand computed results to all results using counts.
-            results_dict = dict(zip(collection.keys(), results))
-            results = [results_dict[key] for key in hashable_circuits]
+        if use_hashes:
+            # Expand computed and cached results to all results, in order.
+            results = [
+                result_cache[key] if index is None else results[index]
+                for key, index in zip(hashable_circuits, result_indices)
+            ]
+
+            if cached is not None:
+                result_cache.update(zip(hashable_circuits, results))
 
         return self._post_run(results)
 
+    def _kwargs_result_cache(
+        self, kwargs: dict[str, Any]
+    ) -> dict[cirq.FrozenCircuit, QuantumResult] | None:
+        """Returns the cache of results obtained with the given keyword
+        arguments to the executor, or None if results are not cached or the
+        keyword arguments are unhashable.
+        """
+        if not self._cache_results:
+            return None
+        kwargs_key = tuple(sorted(kwargs.items()))
+        try:
+            return self._result_cache.setdefault(kwargs_key, {})
+        except TypeError:
+            return None
+
     def _post_run(
         self, results: Sequence[QuantumResult]
     ) -> Sequence[QuantumResult]:
@@ -331,6 +553,75 @@ class Executor:
         """
         return results
 
+    def _run_batches(self, to_run: Sequence[QPROGRAM], **kwargs: Any) -> None:
+        """Runs the circuits in batches with the (batched) executor, keeping
+        up to ``max_concurrent_batches`` batches in flight.
+
+        Args:
+            to_run: Circuits to run.
+        """
+        start = 0
+        completed = 0
+        batch_size = (
+            _AdaptiveBatchSize(self._max_batch_size)
+            if self._adaptive_batch_size
+            else None
+        )
+        step = self._max_batch_size if batch_size is None else batch_size.size
+
+        if self._max_concurrent_batches == 1:
+            while start < len(to_run):
+                batch = to_run[start : start + step]
+                start += len(batch)
+                result, seconds = self._timed_executor_call(batch, **kwargs)
+                self._store_results(batch, result)
+                completed += len(batch)
+                if batch_size is not None:
+                    batch_size.update(
+                        len(batch), seconds, completed, len(to_run) - start
+                    )
+                    step = batch_size.size
+            return
+
+        in_flight: deque[tuple[Sequence[QPROGRAM], Future[Any]]] = deque()
+        with ThreadPoolExecutor(self._max_concurrent_batches) as pool:
+            while start < len(to_run) or in_flight:
+                while (
+                    start < len(to_run)
+                    and len(in_flight) < self._max_concurrent_batches
+                ):
+                    batch = to_run[start : start + step]
+                    start += len(batch)
+                    in_flight.append(
+                        (
+                            batch,
+                            pool.submit(
+                                self._timed_executor_call, batch, **kwargs
+                            ),
+                        )
+                    )
+
+                # Collect batches in submission order to preserve ordering.
+                batch, future = in_flight.popleft()
+                result, seconds = future.result()
+                self._store_results(batch, result)
+                completed += len(batch)
+                if batch_size is not None:
+                    batch_size.update(
+                        len(batch), seconds, completed, len(to_run) - start
+                    )
+                    step = batch_size.size
+
+    def _timed_executor_call(
+        self, to_run: QPROGRAM | Sequence[QPROGRAM], **kwargs: Any
+    ) -> tuple[Any, float]:
+        """Calls the executor and returns its result along with the wall-clock
+        time of the call in seconds.
+        """
+        tic = time.perf_counter()
+        result = self._executor(to_run, **kwargs)
+        return result, time.perf_counter() - tic
+
     def _call_executor(
         self, to_run: QPROGRAM | Sequence[QPROGRAM], **kwargs: Any
     ) -> None:
@@ -341,12 +632,18 @@ class Executor:
         Args:
             to_run: Circuit(s) to run.
         """
-        result = self._executor(to_run, **kwargs)
-        self._calls_to_executor += 1
+        self._store_results(to_run, self._executor(to_run, **kwargs))
 
-        if self.can_batch:
-            self._quantum_results.extend(result)
-            self._executed_circuits.extend(to_run)
-        else:
-            self._quantum_results.append(result)
-            self._executed_circuits.append(to_run)
+    def _store_results(
+        self, to_run: QPROGRAM | Sequence[QPROGRAM], result: Any
+    ) -> None:
+        """Stores the executed circuit(s) and the corresponding result(s) of
+        one call to the executor.
+
+        Args:
+            to_run: Circuit(s) that were run.
+            result: Result(s) returned by the executor.
+        """
+        self._calls_to_executor += 1
+        self._stash_results(result)
+        self._stash_circuits(to_run)
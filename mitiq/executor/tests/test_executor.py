@@ -5,6 +5,11 @@
 
 """Unit tests for Collector."""
 
+import gc
+import threading
+import time
+import warnings
+import weakref
 from random import choices
 
 import cirq
@@ -13,7 +18,9 @@ import pyquil
 import pytest
 from qiskit import QuantumCircuit
 
+import mitiq
 from mitiq import MeasurementResult
+from mitiq.executor import executor as executor_module
 from mitiq.executor.executor import Executor
 from mitiq.interface.mitiq_cirq import (
     compute_density_matrix,
@@ -103,6 +110,96 @@ def test_executors_can_batch():
     assert Executor(executor_measurements_batched).can_batch
 
 
+def test_executor_return_type_flags():
+    executor = Executor(executor_measurements_batched)
+    assert executor._can_batch
+    assert executor._returns_measurements
+    assert not executor._returns_float
+    assert not executor._returns_density_matrix
+
+    executor = Executor(executor_serial)
+    assert not executor._can_batch
+    assert executor._returns_float
+
+    assert Executor(executor_density_matrix_typed)._returns_density_matrix
+
+
+def test_executor_return_type_classified_once(monkeypatch):
+    calls = []
+    is_annotation_in = executor_module._is_annotation_in
+
+    def counting_is_annotation_in(annotation, annotations):
+        calls.append(annotation)
+        return is_annotation_in(annotation, annotations)
+
+    monkeypatch.setattr(
+        executor_module, "_is_annotation_in", counting_is_annotation_in
+    )
+
+    executor = Executor(executor_batched)
+    ncalls = len(calls)
+    assert ncalls > 0
+
+    circuit = cirq.Circuit(cirq.X(cirq.LineQubit(0)))
+    executor.evaluate([circuit] * 3)
+    executor.run([circuit] * 3)
+    assert len(calls) == ncalls
+
+
+def test_executor_return_annotation_cached(monkeypatch):
+    inspected = []
+    getfullargspec = executor_module.inspect.getfullargspec
+
+    def counting_getfullargspec(func):
+        inspected.append(func)
+        return getfullargspec(func)
+
+    monkeypatch.setattr(
+        executor_module.inspect, "getfullargspec", counting_getfullargspec
+    )
+    executor_module._return_annotations.clear()
+    Executor(executor_batched)
+    Executor(executor_batched)
+    assert inspected == [executor_batched]
+
+    class UnhashableExecutor:
+        __hash__ = None
+
+        def __call__(self, circuits) -> list[float]:
+            return [0.0] * len(circuits)
+
+    inspected.clear()
+    assert Executor(UnhashableExecutor()).can_batch
+    assert len(inspected) == 1
+
+
+def test_executor_return_annotation_cache_does_not_keep_executors_alive():
+    class Backend:
+        def run(self, circuits) -> list[float]:
+            return [0.0] * len(circuits)
+
+    backend = Backend()
+    backend_ref = weakref.ref(backend)
+    assert Executor(backend.run).can_batch
+    assert Executor(backend.run).can_batch
+    assert Backend.run in executor_module._return_annotations
+
+    def make_executor(backend):
+        def execute(circuits) -> list[float]:
+            return backend.run(circuits)
+
+        return execute
+
+    execute = make_executor(backend)
+    assert Executor(execute).can_batch
+    nannotations = len(executor_module._return_annotations)
+
+    del backend, execute
+    gc.collect()
+    assert backend_ref() is None
+    assert len(executor_module._return_annotations) == nannotations - 1
+
+
 def test_executor_non_hermitian_observable():
     obs = Observable(PauliString("Z", coeff=1j))
 
@@ -115,6 +212,27 @@ def test_executor_non_hermitian_observable():
         executor.evaluate(circuits, obs)
 
 
+@pytest.mark.parametrize("coeff", (1j, -1j, 0.5 - 0.5j))
+def test_executor_non_hermitian_observable_negative_imaginary(coeff):
+    obs = Observable(PauliString("Z"), PauliString("X", coeff=coeff))
+    assert obs._non_hermitian
+
+    circuit = cirq.Circuit(cirq.I.on(cirq.LineQubit(0)))
+    with pytest.warns(UserWarning, match="hermitian"):
+        Executor(executor_measurements_typed).evaluate(circuit, obs)
+
+
+def test_executor_hermitian_observable_does_not_warn():
+    obs = Observable(PauliString("Z", coeff=-2.0))
+    assert not obs._non_hermitian
+
+    circuit = cirq.Circuit(cirq.I.on(cirq.LineQubit(0)))
+    with warnings.catch_warnings(record=True) as record:
+        warnings.simplefilter("always")
+        Executor(executor_measurements_typed).evaluate(circuit, obs)
+    assert not any("hermitian" in str(w.message) for w in record)
+
+
 def test_run_executor_single_circuit():
     collector = Executor(executor=executor_serial)
     circuit = cirq.Circuit(cirq.H(cirq.LineQubit(0)))
@@ -155,6 +273,30 @@ def test_run_executor_nonidentical_pyquil_programs(batch_size):
         assert collector.calls_to_executor == 1
 
 
+@pytest.mark.parametrize("force_run_all", (True, False))
+def test_run_executor_converts_each_program_once(monkeypatch, force_run_all):
+    conversions = []
+
+    def convert_to_mitiq(circuit):
+        conversions.append(circuit)
+        return mitiq.interface.convert_to_mitiq(circuit)
+
+    monkeypatch.setattr(
+        "mitiq.executor.executor.convert_to_mitiq", convert_to_mitiq
+    )
+
+    x, h = pyquil.Program(pyquil.gates.X(0)), pyquil.Program(pyquil.gates.H(0))
+    collector = Executor(executor_pyquil_batched, cache_results=True)
+    collector.run([x, h] * 5, force_run_all=force_run_all)
+    assert conversions == [x, h]
+
+    # Cirq circuits are used as they are.
+    conversions.clear()
+    circuit = cirq.Circuit(cirq.H(cirq.LineQubit(0)))
+    Executor(executor_batched).run([circuit] * 5, force_run_all=False)
+    assert conversions == []
+
+
 @pytest.mark.parametrize("ncircuits", (10, 11, 23))
 @pytest.mark.parametrize("batch_size", (1, 2, 5, 50))
 def test_run_executor_all_unique(ncircuits, batch_size):
@@ -174,6 +316,102 @@ def test_run_executor_all_unique(ncircuits, batch_size):
     assert collector.calls_to_executor == np.ceil(ncircuits / batch_size)
 
 
+def test_run_executor_adaptive_batch_size(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(
+        "mitiq.executor.executor.time.perf_counter", lambda: clock[0]
+    )
+    batch_sizes = []
+
+    def executor(circuits) -> list[float]:
+        # Fixed per-call overhead, so larger batches are always faster.
+        clock[0] += 1.0
+        batch_sizes.append(len(circuits))
+        return [float(len(circuit)) for circuit in circuits]
+
+    collector = Executor(executor, max_batch_size=8, adaptive_batch_size=True)
+    circuits = [
+        cirq.Circuit([cirq.H(cirq.LineQubit(0))] * (i % 3 + 1))
+        for i in range(30)
+    ]
+    results = collector.run(circuits)
+
+    assert results == [float(i % 3 + 1) for i in range(30)]
+    assert batch_sizes == [1, 2, 4, 8, 8, 7]
+    assert collector.calls_to_executor == len(batch_sizes)
+
+    # Sustained slower executions per circuit shrink the batch size, and the
+    # slower batch size is not tried again.
+    batch_sizes.clear()
+
+    def slow_executor(circuits) -> list[float]:
+        clock[0] += len(circuits) ** 2
+        batch_sizes.append(len(circuits))
+        return [0.0] * len(circuits)
+
+    collector = Executor(
+        slow_executor, max_batch_size=8, adaptive_batch_size=True
+    )
+    collector.run(circuits[:10])
+    assert batch_sizes == [1, 2, 2, 1, 1, 1, 1, 1]
+
+
+def test_run_executor_adaptive_batch_size_noisy_timings(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(
+        "mitiq.executor.executor.time.perf_counter", lambda: clock[0]
+    )
+    random_state = np.random.RandomState(seed=1)
+    batch_sizes = []
+
+    def executor(circuits) -> list[float]:
+        # Per-call overhead, time per circuit and jitter.
+        clock[0] += 1.0 + 0.1 * len(circuits) + random_state.uniform(0, 0.1)
+        batch_sizes.append(len(circuits))
+        return [0.0] * len(circuits)
+
+    collector = Executor(executor, max_batch_size=16, adaptive_batch_size=True)
+    collector.run([cirq.Circuit()] * 300)
+
+    # Jitter does not shrink the batch size once it reaches the maximum.
+    assert batch_sizes[:5] == [1, 2, 4, 8, 16]
+    assert set(batch_sizes[4:-1]) == {16}
+    assert collector.calls_to_executor == 4 + int(np.ceil(285 / 16))
+
+
+def test_run_executor_concurrent_batches_preserve_order():
+    # Each pair of batches must be in flight at the same time to get past
+    # the barrier, and the second one of each pair finishes first.
+    barrier = threading.Barrier(2, timeout=10)
+
+    def executor(circuits) -> list[float]:
+        index = barrier.wait()
+        if index == 0:
+            time.sleep(0.01)
+        return [float(len(circuit)) for circuit in circuits]
+
+    collector = Executor(executor, max_batch_size=3, max_concurrent_batches=2)
+    circuits = [
+        cirq.Circuit([cirq.H(cirq.LineQubit(0))] * (i + 1)) for i in range(12)
+    ]
+    results = collector.run(circuits)
+
+    assert results == [float(i + 1) for i in range(12)]
+    assert collector.executed_circuits == circuits
+    assert collector.calls_to_executor == 4
+
+
+@pytest.mark.parametrize("max_batch_size", (0, -1))
+def test_executor_invalid_max_batch_size(max_batch_size):
+    with pytest.raises(ValueError, match="batch size"):
+        Executor(executor_batched, max_batch_size=max_batch_size)
+
+
+def test_executor_invalid_max_concurrent_batches():
+    with pytest.raises(ValueError, match="concurrent batches"):
+        Executor(executor_batched, max_concurrent_batches=0)
+
+
 @pytest.mark.parametrize("ncircuits", (5, 21))
 @pytest.mark.parametrize("force_run_all", (True, False))
 def test_run_executor_force_run_all_serial_executor_identical_circuits(
@@ -207,6 +445,62 @@ def test_run_executor_preserves_order(s, b):
     assert np.allclose(collector.run(batch), executor_batched_unique(batch))
 
 
+@pytest.mark.parametrize("force_run_all", (True, False))
+@pytest.mark.parametrize(
+    "execute", [executor_serial_unique, executor_batched_unique]
+)
+def test_run_executor_cache_results(execute, force_run_all):
+    q = cirq.LineQubit(0)
+    short = cirq.Circuit(cirq.H(q))
+    long = cirq.Circuit([cirq.H(q)] * 3)
+
+    collector = Executor(execute, cache_results=True)
+    results = collector.run([short, short], force_run_all=force_run_all)
+    assert results == [1, 1]
+    nexecuted = len(collector.executed_circuits)
+
+    results = collector.run([long, short, long], force_run_all=force_run_all)
+    assert results == [3, 1, 3]
+    assert collector.executed_circuits.count(short) == (
+        2 if force_run_all else 1
+    )
+    assert short not in collector.executed_circuits[nexecuted:]
+
+    calls = collector.calls_to_executor
+    assert collector.run([short, long], force_run_all) == [1, 3]
+    assert collector.calls_to_executor == calls
+
+
+def test_run_executor_no_cache_by_default():
+    collector = Executor(executor_serial_unique)
+    circuit = cirq.Circuit(cirq.H(cirq.LineQubit(0)))
+    collector.run(circuit, force_run_all=False)
+    collector.run(circuit, force_run_all=False)
+    assert collector.calls_to_executor == 2
+
+
+def test_run_executor_cache_keyed_by_kwargs():
+    def execute(circuit, noise=0.0, shots=None) -> float:
+        return 1.0 - noise
+
+    collector = Executor(execute, cache_results=True)
+    circuit = cirq.Circuit(cirq.H(cirq.LineQubit(0)))
+    assert collector.evaluate(circuit, noise=0.0) == [1.0]
+    assert collector.evaluate(circuit, noise=0.5) == [0.5]
+    assert collector.calls_to_executor == 2
+
+    # Reused only for the same keyword arguments, in any order.
+    assert collector.evaluate(circuit, shots=10, noise=0.5) == [0.5]
+    assert collector.evaluate(circuit, noise=0.5, shots=10) == [0.5]
+    assert collector.evaluate(circuit, noise=0.5) == [0.5]
+    assert collector.calls_to_executor == 3
+
+    # Unhashable keyword arguments bypass the cache.
+    collector.evaluate(circuit, shots=[10])
+    collector.evaluate(circuit, shots=[10])
+    assert collector.calls_to_executor == 5
+
+
 @pytest.mark.parametrize(
     "execute", [executor_serial_unique, executor_batched_unique]
 )
@@ -230,6 +524,18 @@ def test_executor_evaluate_float(execute):
     assert executor.quantum_results == [2, 3]
 
 
+def test_executor_evaluate_float_discards_negligible_imaginary_part():
+    def execute(circuits) -> list[float]:
+        return [len(circuit) + 1e-16j for circuit in circuits]
+
+    q = cirq.LineQubit(0)
+    circuits = [cirq.Circuit(cirq.X(q)), cirq.Circuit(cirq.H(q), cirq.Z(q))]
+    results = Executor(execute).evaluate(circuits)
+
+    assert results == [1.0, 2.0]
+    assert all(isinstance(result, float) for result in results)
+
+
 @pytest.mark.parametrize(
     "execute", [executor_measurements_typed, executor_measurements_batched]
 )
@@ -260,6 +566,24 @@ def test_executor_evaluate_measurements(execute):
     assert len(executor.quantum_results) == len(circuits)
 
 
+def test_executor_evaluate_measurements_multiple_groups():
+    obs = Observable(PauliString("X"), PauliString("Z", coeff=2.0))
+    assert obs.ngroups == 2
+
+    q = cirq.LineQubit(0)
+    circuits = [cirq.Circuit(cirq.I.on(q)), cirq.Circuit(cirq.X.on(q))]
+
+    executor = Executor(executor_measurements_batched)
+    results = executor.evaluate(circuits, obs)
+
+    assert np.allclose(results, [2, -2], atol=0.2)
+    assert executor.executed_circuits == [
+        measured
+        for circuit in circuits
+        for measured in obs.measure_in(circuit)
+    ]
+
+
 @pytest.mark.parametrize(
     "execute", [executor_density_matrix_typed, executor_density_matrix_batched]
 )
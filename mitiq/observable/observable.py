@@ -3,9 +3,9 @@
 # This source code is licensed under the GPL license (v3) found in the
 # LICENSE file in the root directory of this source tree.
 
-import copy
+import cmath
 from collections import defaultdict
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Iterable, Sequence
 from numbers import Number
 from typing import Any, cast
 
@@ -26,11 +26,27 @@ class Observable:
     """
 
     def __init__(self, *paulis: PauliString) -> None:
-        self._paulis = _combine_duplicate_pauli_strings(paulis)
+        self._set_paulis(_combine_duplicate_pauli_strings(paulis))
         self._groups: list[PauliStringCollection]
         self._ngroups: int
         self.partition()
 
+    def _set_paulis(self, paulis: list[PauliString]) -> None:
+        """Sets the Pauli strings of the Observable and resets all quantities
+        cached from them.
+        """
+        self._paulis = paulis
+        self._non_hermitian = any(
+            abs(pauli.coeff.imag) > 0.0001 for pauli in paulis
+        )
+        self._qubit_set = {q for pauli in paulis for q in pauli._pauli.qubits}
+        self._qubit_indices = [
+            cast(cirq.LineQubit, q).x for q in sorted(self._qubit_set)
+        ]
+        self._matrix_cache: dict[
+            tuple[int, ...], npt.NDArray[np.complex64]
+        ] = {}
+
     @staticmethod
     def from_pauli_string_collections(
         *pauli_string_collections: PauliStringCollection,
@@ -48,11 +64,13 @@ class Observable:
         obs = Observable()
         obs._groups = list(pauli_string_collections)
         obs._ngroups = len(pauli_string_collections)
-        obs._paulis = [
-            pauli
-            for pauli_string_collection in pauli_string_collections
-            for pauli in pauli_string_collection.elements
-        ]
+        obs._set_paulis(
+            [
+                pauli
+                for pauli_string_collection in pauli_string_collections
+                for pauli in pauli_string_collection.elements
+            ]
+        )
         return obs
 
     @property
@@ -61,7 +79,7 @@ class Observable:
 
     def _qubits(self) -> set[cirq.Qid]:
         """Returns all qubits acted on by the Observable."""
-        return {q for pauli in self._paulis for q in pauli._pauli.qubits}
+        return set(self._qubit_set)
 
     @property
     def paulis(self) -> list[PauliString]:
@@ -69,11 +87,11 @@ class Observable:
 
     @property
     def qubit_indices(self) -> list[int]:
-        return [cast(cirq.LineQubit, q).x for q in sorted(self._qubits())]
+        return list(self._qubit_indices)
 
     @property
     def nqubits(self) -> int:
-        return len(self.qubit_indices)
+        return len(self._qubit_indices)
 
     def __mul__(
         self, other: "Observable | PauliString | Number"
@@ -121,20 +139,28 @@ class Observable:
         rng = np.random.RandomState(seed)
 
         psets: list[PauliStringCollection] = []
-        paulis = copy.deepcopy(self._paulis)
-        rng.shuffle(paulis)  # type: ignore
+        # Measurement basis of each group on every qubit it acts on, so that
+        # compatibility is checked in O(weight) instead of against every
+        # element of the group.
+        bases: list[dict[cirq.Qid, cirq.Pauli]] = []
+        # Pauli strings are never mutated here, so shuffling indices suffices
+        # and avoids copying them.
+        paulis = [self._paulis[i] for i in rng.permutation(len(self._paulis))]
 
         while paulis:
             pauli = paulis.pop()
-            added = False
-            for i, pset in enumerate(psets):
-                if pset.can_add(pauli):
-                    pset.add(pauli)
-                    added = True
+            pauli_basis = dict(pauli._pauli.items())
+            for pset, basis in zip(psets, bases):
+                if all(
+                    basis.get(qubit, gate) == gate
+                    for qubit, gate in pauli_basis.items()
+                ):
+                    pset.add(pauli, check_precondition=False)
+                    basis.update(pauli_basis)
                     break
-
-            if not added:
+            else:
                 psets.append(PauliStringCollection(pauli))
+                bases.append(pauli_basis)
 
         self._groups = psets
         self._ngroups = len(self._groups)
@@ -166,17 +192,26 @@ class Observable:
             ordering from `self.qubit_indices` is used.
 
         Returns:
-            A ``NumPy`` array representing the matrix form of the observable.
+            A read-only ``NumPy`` array representing the matrix form of the
+            observable. The matrix is cached per qubit ordering and shared
+            between calls, so use ``.copy()`` to get a writable matrix.
         """
         if qubit_indices is None:
-            qubit_indices = self.qubit_indices
-        n = len(qubit_indices)
-
-        obs_matrix = np.zeros(shape=(2**n, 2**n), dtype=np.complex64)
-        for pauli in self._paulis:
-            obs_matrix += pauli.matrix(qubit_indices_to_include=qubit_indices)
-
-        return obs_matrix
+            qubit_indices = self._qubit_indices
+        key = tuple(qubit_indices)
+
+        if key not in self._matrix_cache:
+            n = len(qubit_indices)
+            obs_matrix = np.zeros(shape=(2**n, 2**n), dtype=np.complex64)
+            for pauli in self._paulis:
+                obs_matrix += pauli.matrix(
+                    qubit_indices_to_include=qubit_indices
+                )
+            # Guard the cached matrix against in-place modification.
+            obs_matrix.setflags(write=False)
+            self._matrix_cache[key] = obs_matrix
+
+        return self._matrix_cache[key]
 
     def expectation(
         self, circuit: QPROGRAM, execute: Callable[[QPROGRAM], QuantumResult]
@@ -199,7 +234,7 @@ class Observable:
         return Executor(execute).evaluate(circuit, observable=self)[0]
 
     def _expectation_from_measurements(
-        self, measurements: list[MeasurementResult]
+        self, measurements: Iterable[MeasurementResult]
     ) -> float:
         return sum(
             pset._expectation_from_measurements(bitstrings)
@@ -209,24 +244,72 @@ class Observable:
     def _expectation_from_density_matrix(
         self, density_matrix: npt.NDArray[np.complex64]
     ) -> float:
+        return self._batched_expectation_from_density_matrices(
+            [density_matrix]
+        )[0]
+
+    def _batched_expectation_from_density_matrices(
+        self, density_matrices: Sequence[npt.NDArray[np.complex64]]
+    ) -> list[float]:
+        """Returns the expectation value of the observable for each density
+        matrix, computed with a single contraction over all of them.
+
+        Args:
+            density_matrices: Density matrices acting on (at least) the qubits
+                of the observable.
+        """
+        if len(density_matrices) == 0:
+            return []
+
         observable_matrix = self.matrix()
 
-        if density_matrix.shape != observable_matrix.shape:
-            nqubits = int(np.log2(density_matrix.shape[0]))
-            density_matrix = cirq.partial_trace(
-                np.reshape(density_matrix, newshape=[2, 2] * nqubits),
-                keep_indices=self.qubit_indices,
-            ).reshape(observable_matrix.shape)
+        reduced = []
+        for density_matrix in density_matrices:
+            if density_matrix.shape != observable_matrix.shape:
+                nqubits = int(np.log2(density_matrix.shape[0]))
+                density_matrix = cirq.partial_trace(
+                    np.reshape(density_matrix, newshape=[2, 2] * nqubits),
+                    keep_indices=self._qubit_indices,
+                ).reshape(observable_matrix.shape)
+            reduced.append(density_matrix)
+        rhos = np.array(reduced)
+
+        # The trace is linear, so contract against the summed matrix instead
+        # of each Pauli string, accumulating in double precision.
+        expectations = np.einsum(
+            "ij,nji->n", observable_matrix, rhos, dtype=np.complex128
+        )
 
-        return np.real_if_close(
-            np.trace(density_matrix @ observable_matrix)
-        ).item()
+        # Discard negligible imaginary parts relative to the input precision.
+        precision = np.result_type(rhos.dtype, np.complex64)
+        return [
+            np.real_if_close(expectation).item()
+            for expectation in expectations.astype(precision)
+        ]
 
     def __str__(self) -> str:
         return " + ".join(map(str, self._paulis))
 
     def __eq__(self, other: Any) -> bool:
-        return np.allclose(self.matrix(), other.matrix())
+        # Compare coefficients of each Pauli string instead of the (very
+        # large) matrices, with the same tolerances as ``np.allclose``.
+        if isinstance(other, PauliString):
+            other_paulis = [other]
+        elif isinstance(other, Observable):
+            other_paulis = other._paulis
+        else:
+            return NotImplemented
+        coefficients = _pauli_string_coefficients(self._paulis)
+        other_coefficients = _pauli_string_coefficients(other_paulis)
+        return all(
+            cmath.isclose(
+                coefficients.get(pauli, 0.0),
+                other_coefficients.get(pauli, 0.0),
+                rel_tol=1e-5,
+                abs_tol=1e-8,
+            )
+            for pauli in coefficients.keys() | other_coefficients.keys()
+        )
 
 
 def _combine_duplicate_pauli_strings(
@@ -237,14 +320,25 @@ def _combine_duplicate_pauli_strings(
 
     Returns: deduped list of PauliStrings.
     """
+    pauli_string_coefficients = _pauli_string_coefficients(paulis)
+    # Same tolerance as ``np.isclose(coeff, 0.0)``, without array overhead.
+    return [
+        pauli_string.with_coeff(coeff)
+        for (pauli_string, coeff) in pauli_string_coefficients.items()
+        if abs(coeff) > 1e-8
+    ]
+
+
+def _pauli_string_coefficients(
+    paulis: Iterable[PauliString],
+) -> defaultdict[PauliString, complex]:
+    """Returns the total coefficient of each PauliString (with unit
+    coefficient) in ``paulis``.
+    """
     pauli_string_coefficients: defaultdict[PauliString, complex] = defaultdict(
         complex
     )
     for pauli_string in paulis:
         cache_key = pauli_string.with_coeff(1)
         pauli_string_coefficients[cache_key] += pauli_string.coeff
-    return [
-        pauli_string.with_coeff(coeff)
-        for (pauli_string, coeff) in pauli_string_coefficients.items()
-        if not np.isclose(coeff, 0.0)
-    ]
+    return pauli_string_coefficients
@@ -306,15 +306,24 @@ class PauliStringCollection:
     def _expectation_from_measurements(
         self, measurements: MeasurementResult
     ) -> float:
+        # Pack the bits of all qubits in the collection once, then select the
+        # bits each PauliString acts on with a bit mask.
+        qubits = sorted(self.support())
+        words = _pack_bits(
+            measurements.filter_qubits(qubits).reshape(
+                measurements.shots, len(qubits)
+            )
+        )
+        column = {qubit: i for i, qubit in enumerate(qubits)}
+
         total = 0.0
         for pauli in self.elements:
-            bitstrings = measurements.filter_qubits(sorted(pauli.support()))
-            value = (
-                np.average([(-1) ** np.sum(bits) for bits in bitstrings])
-                if len(bitstrings) > 0
-                else 1.0
+            mask = np.zeros(len(qubits), dtype=np.uint8)
+            mask[[column[qubit] for qubit in pauli.support()]] = 1
+            total += cast(
+                float,
+                pauli.coeff * _parity_expectation(words, _pack_bits(mask)),
             )
-            total += pauli.coeff * value
         return total
 
     def __eq__(self, other: Any) -> bool:
@@ -325,3 +334,47 @@ class PauliStringCollection:
 
     def __str__(self) -> str:
         return " + ".join(map(str, self.elements))
+
+
+def _pack_bits(bits: npt.NDArray[Any]) -> npt.NDArray[np.uint64]:
+    """Packs the last axis of an array of bits into 64-bit words. Bit ``j``
+    is stored in bit ``j % 64`` of word ``j // 64``.
+    """
+    nwords = -(-bits.shape[-1] // 64)
+    packed = np.packbits(
+        np.asarray(bits, dtype=np.uint8), axis=-1, bitorder="little"
+    )
+    padding = [(0, 0)] * (packed.ndim - 1) + [
+        (0, 8 * nwords - packed.shape[-1])
+    ]
+    padded = np.ascontiguousarray(np.pad(packed, padding))
+    return padded.view(np.dtype("<u8")).astype(np.uint64)
+
+
+# Available in NumPy >= 2.0.
+_bitwise_count = getattr(np, "bitwise_count", None)
+
+
+def _parity_expectation(
+    words: npt.NDArray[np.uint64], mask: npt.NDArray[np.uint64]
+) -> float:
+    """Returns the average of :math:`(-1)^{b_1 + ... + b_k}` over all shots,
+    where :math:`b_1, ..., b_k` are the bits selected by ``mask``, or 1.0 if
+    there are no shots.
+
+    Args:
+        words: Array of shape ``(shots, nwords)`` of packed bits.
+        mask: Array of shape ``(nwords,)`` of packed bits to select.
+    """
+    if len(words) == 0:
+        return 1.0
+    # The parity of the selected bits across words is the parity of their
+    # exclusive or.
+    selected = np.bitwise_xor.reduce(words & mask, axis=-1)
+    if _bitwise_count is not None:
+        parities = _bitwise_count(selected) & 1
+    else:
+        for shift in (32, 16, 8, 4, 2, 1):
+            selected ^= selected >> np.uint64(shift)
+        parities = selected & np.uint64(1)
+    return 1.0 - 2.0 * float(np.mean(parities))
@@ -115,6 +115,33 @@ def test_observable_partition_can_be_measured_with():
                 assert pauli_list[i].can_be_measured_with(pauli_list[j])
 
 
+@pytest.mark.parametrize("seed", (0, 1, 2))
+def test_observable_partition_matches_greedy_can_add(seed):
+    rng = np.random.RandomState(seed=seed)
+    obs = Observable(
+        *[
+            PauliString(spec="".join(rng.choice(("I", "X", "Y", "Z"), size=6)))
+            for _ in range(100)
+        ]
+    )
+    obs.partition(seed=seed)
+
+    paulis = list(obs.paulis)
+    np.random.RandomState(seed).shuffle(paulis)
+    expected: list[PauliStringCollection] = []
+    while paulis:
+        pauli = paulis.pop()
+        for pset in expected:
+            if pset.can_add(pauli):
+                pset.add(pauli)
+                break
+        else:
+            expected.append(PauliStringCollection(pauli))
+
+    assert obs.groups == expected
+    assert sum(len(pset) for pset in obs.groups) == obs.nterms
+
+
 def test_observable_measure_in_needs_one_circuit_z():
     pauli1 = PauliString(spec="ZI")
     pauli2 = PauliString(spec="IZ")
@@ -352,3 +379,114 @@ def test_pauli_string_deduplication_removal_of_0_coefficients():
     obs = Observable(*pauli_strings)
     assert obs.nterms == 1
     assert obs == Observable(XI.with_coeff(XI.coeff * 2))
+
+
+def test_observable_expectation_from_density_matrix_matches_trace():
+    obs = Observable(
+        PauliString("XZ", coeff=0.3),
+        PauliString("YY", coeff=-1.2),
+        PauliString("IZ", coeff=0.5),
+    )
+    qubits = cirq.LineQubit.range(3)
+    circuit = cirq.testing.random_circuit(qubits, 5, 1, random_state=3)
+    density_matrix = compute_density_matrix(circuit, noise_level=(0,))
+
+    expected = np.trace(
+        cirq.partial_trace(
+            density_matrix.reshape([2, 2] * 3), keep_indices=[0, 1]
+        ).reshape(4, 4)
+        @ obs.matrix()
+    )
+    assert np.isclose(
+        obs._expectation_from_density_matrix(density_matrix), expected
+    )
+
+
+def test_observable_matrix_is_cached():
+    obs = Observable(PauliString("XZ", coeff=0.3), PauliString("IY"))
+
+    assert obs.matrix() is obs.matrix()
+    assert obs.matrix() is obs.matrix(qubit_indices=[0, 1])
+    assert obs.matrix(qubit_indices=[1, 0]) is not obs.matrix()
+    assert np.allclose(
+        obs.matrix(qubit_indices=[1, 0]),
+        0.3 * np.kron(zmat, xmat) + np.kron(cirq.unitary(cirq.Y), imat),
+    )
+    with pytest.raises(ValueError):
+        obs.matrix()[0, 0] = 1.0
+
+    writable = obs.matrix().copy()
+    writable[0, 0] = 1.0
+    assert obs.matrix()[0, 0] == 0.0
+
+
+def test_observable_partition_does_not_copy_paulis():
+    obs = Observable(PauliString("XI"), PauliString("IZ"), PauliString("ZZ"))
+    obs.partition(seed=1)
+
+    ids = {id(pauli) for pauli in obs.paulis}
+    assert {id(p) for pset in obs.groups for p in pset.elements} == ids
+
+
+def test_observable_qubit_indices_cached():
+    obs = Observable(PauliString("Z", support=(3,)), PauliString("XY"))
+    assert obs.qubit_indices == [0, 1, 3]
+    assert obs.nqubits == 3
+
+    # Modifying the returned list does not change the observable.
+    obs.qubit_indices.append(5)
+    assert obs.qubit_indices == [0, 1, 3]
+
+    obs = Observable.from_pauli_string_collections(
+        PauliStringCollection(PauliString("Z", support=(2,))),
+        PauliStringCollection(PauliString("X", support=(4,))),
+    )
+    assert obs.qubit_indices == [2, 4]
+    assert obs._qubits() == {cirq.LineQubit(2), cirq.LineQubit(4)}
+
+
+def test_observable_batched_expectation_from_density_matrices():
+    obs = Observable(PauliString("ZX", coeff=0.7), PauliString("YI"))
+    qubits = cirq.LineQubit.range(3)
+    density_matrices = [
+        compute_density_matrix(
+            cirq.testing.random_circuit(qubits[:n], 4, 1, random_state=seed),
+            noise_level=(0,),
+        )
+        for n, seed in ((2, 1), (3, 2), (2, 3))
+    ]
+
+    expectations = obs._batched_expectation_from_density_matrices(
+        density_matrices
+    )
+    assert np.allclose(
+        expectations,
+        [obs._expectation_from_density_matrix(dm) for dm in density_matrices],
+    )
+    assert all(isinstance(value, float) for value in expectations)
+    assert obs._batched_expectation_from_density_matrices([]) == []
+
+
+def test_observable_equality():
+    obs = Observable(PauliString("XZ", coeff=0.5), PauliString("IY"))
+
+    assert obs == Observable(PauliString("IY"), PauliString("XZ", coeff=0.5))
+    assert obs == Observable(
+        PauliString("XZ", coeff=0.5 + 1e-10), PauliString("IY")
+    )
+    assert obs != Observable(PauliString("XZ", coeff=0.5))
+    assert obs != Observable(PauliString("XZ", coeff=-0.5), PauliString("IY"))
+    assert Observable(PauliString("Z")) == PauliString("Z")
+    assert Observable(PauliString("Z")) != PauliString("Z", support=(1,))
+    assert obs != "XZ"
+
+    # The same operators on different qubits are not equal.
+    assert Observable(PauliString("Z", support=(0,))) != Observable(
+        PauliString("Z", support=(1,))
+    )
+
+    obs = Observable.from_pauli_string_collections(
+        PauliStringCollection(PauliString("Z")),
+        PauliStringCollection(PauliString("Z")),
+    )
+    assert obs == Observable(PauliString("Z", coeff=2.0))
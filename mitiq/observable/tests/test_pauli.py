@@ -376,6 +376,90 @@ def test_pstringcollection_expectation_from_measurements_qubit_indices():
     assert np.isclose(pset._expectation_from_measurements(measurements), 0.0)
 
 
+@pytest.mark.parametrize("seed", range(3))
+def test_pstringcollection_expectation_from_measurements_random(seed):
+    rng = np.random.RandomState(seed)
+    qubit_indices = (0, 2, 3, 7, 8)
+    bits = rng.randint(low=0, high=1 + 1, size=(500, len(qubit_indices)))
+    measurements = MeasurementResult(bits.tolist(), qubit_indices)
+
+    paulis = [
+        PauliString(spec="ZZ", coeff=0.5, support=(0, 7)),
+        PauliString(spec="ZZZ", coeff=-1.5, support=(2, 3, 8)),
+        PauliString(spec="Z", coeff=2.0, support=(3,)),
+    ]
+    pset = PauliStringCollection(*paulis)
+
+    expected = sum(
+        pauli.coeff
+        * np.average(
+            [(-1) ** np.sum(b) for b in measurements.filter_qubits(s)]
+        )
+        for pauli, s in zip(paulis, ([0, 7], [2, 3, 8], [3]))
+    )
+    assert np.isclose(
+        pset._expectation_from_measurements(measurements), expected
+    )
+
+
+@pytest.mark.parametrize("support", [range(9), range(16), range(70)])
+def test_pstringcollection_expectation_from_measurements_many_qubits(support):
+    """Bits of many qubits are packed into several bytes and words."""
+    support = tuple(support)
+    rng = np.random.RandomState(7)
+    bits = rng.randint(low=0, high=1 + 1, size=(200, len(support)))
+    measurements = MeasurementResult(bits.tolist())
+
+    pset = PauliStringCollection(PauliString(spec="Z" * len(support)))
+    expected = np.average((-1) ** bits.sum(axis=1))
+    assert np.isclose(
+        pset._expectation_from_measurements(measurements), expected
+    )
+
+
+def test_pstringcollection_expectation_from_measurements_several_words():
+    """Two Pauli strings together supported on 130 qubits."""
+    rng = np.random.RandomState(7)
+    bits = rng.randint(low=0, high=1 + 1, size=(200, 130))
+    measurements = MeasurementResult(bits.tolist())
+
+    first = tuple(range(0, 70))
+    second = tuple(range(70, 130))
+    pset = PauliStringCollection(
+        PauliString(spec="Z" * len(first), support=first),
+        PauliString(spec="Z" * len(second), support=second, coeff=-0.5),
+    )
+    expected = np.average((-1) ** bits[:, first].sum(axis=1)) - 0.5 * (
+        np.average((-1) ** bits[:, second].sum(axis=1))
+    )
+    assert np.isclose(
+        pset._expectation_from_measurements(measurements), expected
+    )
+
+
+def _popcount(words):
+    return np.array(
+        [bin(int(word)).count("1") for word in words.ravel()], dtype=np.uint64
+    ).reshape(words.shape)
+
+
+@pytest.mark.parametrize("bitwise_count", (None, _popcount))
+def test_pstringcollection_expectation_from_measurements_parity_paths(
+    monkeypatch, bitwise_count
+):
+    """Parities are the same with and without ``np.bitwise_count``."""
+    monkeypatch.setattr("mitiq.observable.pauli._bitwise_count", bitwise_count)
+    rng = np.random.RandomState(7)
+    bits = rng.randint(low=0, high=1 + 1, size=(200, 70))
+    measurements = MeasurementResult(bits.tolist())
+
+    pset = PauliStringCollection(PauliString(spec="Z" * 70))
+    expected = np.average((-1) ** bits.sum(axis=1))
+    assert np.isclose(
+        pset._expectation_from_measurements(measurements), expected
+    )
+
+
 def test_spec():
     assert PauliString(spec="XIZYII").spec == "XZY"
 